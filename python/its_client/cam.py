@@ -9,26 +9,90 @@
 # [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
-import json
 import logging
-
+import threading
+from functools import lru_cache
 from hashlib import sha256
 
+import orjson
+
 from its_client.mobility import kmph_to_mps
 
 TIMESTAMP_ITS_START = 1072915195000  # its timestamp starts at 2004/01/01T00:00:00.000Z
 
+# static parts of the message, built once and shared by all the messages
+BASIC_CONTAINER_CONFIDENCE = {
+    "position_confidence_ellipse": {
+        "semi_major_confidence": 10,
+        "semi_minor_confidence": 50,
+        "semi_major_orientation": 1,
+    },
+    "altitude": 1,
+}
+HIGH_FREQUENCY_CONTAINER_CONFIDENCE = {"heading": 2, "speed": 3, "vehicle_length": 0}
+LOW_FREQUENCY_CONTAINER = {"vehicle_role": 2}
+
+# skeleton of the message, only its dynamic leaves are written before each serialisation
+_CAM_SKELETON = {
+    "type": "cam",
+    "origin": "self",
+    "version": "1.1.1",
+    "source_uuid": None,
+    "timestamp": None,
+    "message": {
+        "protocol_version": 1,
+        "station_id": None,
+        "generation_delta_time": None,
+        "basic_container": {
+            "station_type": 5,
+            "reference_position": {
+                "latitude": None,
+                "longitude": None,
+                "altitude": None,
+            },
+            "confidence": BASIC_CONTAINER_CONFIDENCE,
+        },
+        "high_frequency_container": {
+            "heading": None,
+            "speed": None,
+            "longitudinal_acceleration": None,
+            "drive_direction": 0,
+            "vehicle_length": 40,
+            "vehicle_width": 20,
+            "confidence": HIGH_FREQUENCY_CONTAINER_CONFIDENCE,
+        },
+        "low_freq_container": LOW_FREQUENCY_CONTAINER,
+    },
+}
+_MESSAGE = _CAM_SKELETON["message"]
+_REFERENCE_POSITION = _MESSAGE["basic_container"]["reference_position"]
+_HIGH_FREQUENCY_CONTAINER = _MESSAGE["high_frequency_container"]
+_CAM_SKELETON_LOCK = threading.Lock()
+
 
+# the uuid of a client doesn't change, so its station id is computed only once
+@lru_cache(maxsize=4)
 def station_id(uuid: str) -> int:
     logging.debug("we compute the station id for " + uuid)
 
-    hasher = sha256()
-    hasher.update(bytes(uuid, "utf-8"))
-    hashed_uuid = hasher.hexdigest()
-    return int(hashed_uuid[0:6], 16)
+    # the first 3 bytes of the hash, as the first 6 hexadecimal digits were
+    return int.from_bytes(sha256(uuid.encode("utf-8")).digest()[:3], "big")
 
 
 class CooperativeAwarenessMessage:
+    __slots__ = (
+        "uuid",
+        "timestamp",
+        "latitude",
+        "longitude",
+        "altitude",
+        "speed",
+        "acceleration",
+        "heading",
+        "station_id",
+        "generation_delta_time",
+    )
+
     def __init__(
         self,
         uuid,
@@ -41,55 +105,26 @@ class CooperativeAwarenessMessage:
         heading=0.0,
     ):
         self.uuid = uuid
-        self.timestamp = int(round(timestamp * 1000))
-        self.latitude = int(round(latitude * 10000000))
-        self.longitude = int(round(longitude * 10000000))
-        self.altitude = int(round(altitude * 100))
-        self.speed = int(round(kmph_to_mps(speed) * 100))
-        self.acceleration = int(round(acceleration * 10))
-        self.heading = int(round(heading * 10))
+        self.timestamp = round(timestamp * 1000)
+        self.latitude = round(latitude * 10000000)
+        self.longitude = round(longitude * 10000000)
+        self.altitude = round(altitude * 100)
+        self.speed = round(kmph_to_mps(speed) * 100)
+        self.acceleration = round(acceleration * 10)
+        self.heading = round(heading * 10)
         self.station_id = station_id(uuid)
+        self.generation_delta_time = (self.timestamp - TIMESTAMP_ITS_START) % 65536
 
-    def generation_delta_time(self) -> int:
-        return (self.timestamp - TIMESTAMP_ITS_START) % 65536
-
-    def to_json(self) -> str:
-        cam_json = {
-            "type": "cam",
-            "origin": "self",
-            "version": "1.1.1",
-            "source_uuid": self.uuid,
-            "timestamp": self.timestamp,
-            "message": {
-                "protocol_version": 1,
-                "station_id": self.station_id,
-                "generation_delta_time": self.generation_delta_time(),
-                "basic_container": {
-                    "station_type": 5,
-                    "reference_position": {
-                        "latitude": self.latitude,
-                        "longitude": self.longitude,
-                        "altitude": self.altitude,
-                    },
-                    "confidence": {
-                        "position_confidence_ellipse": {
-                            "semi_major_confidence": 10,
-                            "semi_minor_confidence": 50,
-                            "semi_major_orientation": 1,
-                        },
-                        "altitude": 1,
-                    },
-                },
-                "high_frequency_container": {
-                    "heading": self.heading,
-                    "speed": self.speed,
-                    "longitudinal_acceleration": self.acceleration,
-                    "drive_direction": 0,
-                    "vehicle_length": 40,
-                    "vehicle_width": 20,
-                    "confidence": {"heading": 2, "speed": 3, "vehicle_length": 0},
-                },
-                "low_freq_container": {"vehicle_role": 2},
-            },
-        }
-        return json.dumps(cam_json)
+    def to_json(self) -> bytes:
+        with _CAM_SKELETON_LOCK:
+            _CAM_SKELETON["source_uuid"] = self.uuid
+            _CAM_SKELETON["timestamp"] = self.timestamp
+            _MESSAGE["station_id"] = self.station_id
+            _MESSAGE["generation_delta_time"] = self.generation_delta_time
+            _REFERENCE_POSITION["latitude"] = self.latitude
+            _REFERENCE_POSITION["longitude"] = self.longitude
+            _REFERENCE_POSITION["altitude"] = self.altitude
+            _HIGH_FREQUENCY_CONTAINER["heading"] = self.heading
+            _HIGH_FREQUENCY_CONTAINER["speed"] = self.speed
+            _HIGH_FREQUENCY_CONTAINER["longitudinal_acceleration"] = self.acceleration
+            return orjson.dumps(_CAM_SKELETON)
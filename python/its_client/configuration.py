@@ -90,6 +90,10 @@ def build(args=None) -> ConfigParser:
     logger.log_setup(
         directory=config.get(section="log", option="directory"),
         log_level=config.get(section="log", option="default_level"),
+        batch_size=config.getint(section="log", option="batch_size", fallback=64),
+        batch_interval=config.getfloat(
+            section="log", option="batch_interval", fallback=1.0
+        ),
     )
     logging.info(f"config loaded from {config_file}")
 
@@ -117,13 +121,12 @@ def build(args=None) -> ConfigParser:
         config.set(section="broker", option="password", value=args.mqtt_password)
 
     # list all used contents
-    logging.info("used configuration:")
-    for section in config.sections():
-        logging.info(f"section: {section}")
-        for option in config.options(section):
-            if option == "password":
-                option_value = "****"
-            else:
-                option_value = config.get(section, option)
-            logging.info("x %s:::%s:::%s" % (option, option_value, str(type(option))))
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info("used configuration:")
+        for section in config.sections():
+            logging.info("section: %s", section)
+            for option, option_value in config.items(section):
+                if option == "password":
+                    option_value = "****"
+                logging.info("x %s:::%s:::%s", option, option_value, type(option))
     return config
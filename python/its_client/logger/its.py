@@ -19,6 +19,6 @@ def record(
 
 
 def create_cam(
-    json_cam: str,
+    json_cam: bytes,
 ):
-    logging.getLogger("sending").info(f"{json_cam}")
+    logging.getLogger("sending").info(json_cam.decode())
@@ -9,18 +9,120 @@
 # [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 
 
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler writing the records by batch: the formatted records are kept in memory
+    and written with a single write as soon as batch_size records are pending, or by a timer
+    batch_interval seconds after the first pending record
+    """
+
+    def __init__(
+        self, filename, maxBytes=0, backupCount=0, batch_size=64, batch_interval=1.0
+    ):
+        super().__init__(filename=filename, maxBytes=maxBytes, backupCount=backupCount)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.batch = []
+        self.timer = None
+
+    def emit(self, record):
+        try:
+            self.batch.append(self.format(record) + self.terminator)
+            if len(self.batch) >= self.batch_size:
+                self._write_batch()
+            elif self.timer is None:
+                # a lone record is written even if no other one comes after it
+                self.timer = threading.Timer(self.batch_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._write_batch()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            # the pending records are written by the flush of the stream handler
+            super().close()
+        finally:
+            self.release()
+
+    def _write_batch(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.batch:
+            return
+        data = "".join(self.batch)
+        self.batch.clear()
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            self.stream.seek(0, 2)
+            if self.stream.tell() + len(data) >= self.maxBytes:
+                self.doRollover()
+        self.stream.write(data)
+        self.stream.flush()
+
+
+class SecondCachedFormatter(logging.Formatter):
+    """
+    Formatter reusing the formatted date of the previous record while the second doesn't change:
+    only the milliseconds are formatted again
+    """
+
+    def __init__(self, fmt=None):
+        super().__init__(fmt=fmt)
+        self.cached_time = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, formatted_time = self.cached_time
+        if second != cached_second:
+            formatted_time = time.strftime(
+                self.default_time_format, self.converter(second)
+            )
+            self.cached_time = (second, formatted_time)
+        return self.default_msec_format % (formatted_time, record.msecs)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler enqueuing the records as they are: the queue doesn't leave the process, so
+    neither the formatting nor a copy of the record is needed on the logging thread, the file
+    handlers format the records on the listener thread
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_MONITORING_FUNCTIONS = frozenset({"monitore_cam", "monitore_cpm", "monitore_denm"})
+_SENDING_FUNCTIONS = frozenset({"create_cam", "create_denm"})
+
+
 def filter_monitoring(record):
-    return (
-        record.funcName == "monitore_cam"
-        or record.funcName == "monitore_cpm"
-        or record.funcName == "monitore_denm"
-    )
+    return record.funcName in _MONITORING_FUNCTIONS
 
 
 def filter_reception(record):
@@ -28,18 +130,21 @@ def filter_reception(record):
 
 
 def filter_sending(record):
-    return record.funcName == "create_cam" or record.funcName == "create_denm"
+    return record.funcName in _SENDING_FUNCTIONS
 
 
 def filter_default(record):
-    return (
-        not record.funcName.startswith("create_")
-        and not record.funcName == "record"
-        and not record.funcName.startswith("monitore_")
+    return record.funcName != "record" and not record.funcName.startswith(
+        ("create_", "monitore_")
     )
 
 
-def log_setup(directory: str = "/data", log_level=logging.WARNING):
+def log_setup(
+    directory: str = "/data",
+    log_level=logging.WARNING,
+    batch_size: int = 64,
+    batch_interval: float = 1.0,
+):
     path = Path(directory + "/its_client")
     path.mkdir(parents=True, exist_ok=True)
     # monitoring
@@ -50,35 +155,60 @@ def log_setup(directory: str = "/data", log_level=logging.WARNING):
         backupCount=10,
     )
     monitoring_handler.addFilter(filter_monitoring)
-    monitoring_logger.addHandler(monitoring_handler)
     # let's monitor on any level
     monitoring_logger.setLevel("DEBUG")
 
     # reception
     reception_logger = logging.getLogger("reception")
-    reception_handler = logging.handlers.RotatingFileHandler(
-        filename=path / "reception.txt", maxBytes=200000000, backupCount=10
+    reception_handler = BatchRotatingFileHandler(
+        filename=path / "reception.txt",
+        maxBytes=200000000,
+        backupCount=10,
+        batch_size=batch_size,
+        batch_interval=batch_interval,
     )
     reception_handler.addFilter(filter_reception)
-    reception_logger.addHandler(reception_handler)
     reception_logger.setLevel(log_level)
 
     # sending
     sending_logger = logging.getLogger("sending")
-    sending_handler = logging.handlers.RotatingFileHandler(
+    sending_handler = BatchRotatingFileHandler(
         filename=path / "sending.txt",
         maxBytes=2000000,
         backupCount=10,
+        batch_size=batch_size,
+        batch_interval=batch_interval,
     )
     sending_handler.addFilter(filter_sending)
-    sending_logger.addHandler(sending_handler)
     sending_logger.setLevel(log_level)
 
+    # the files are written by a background thread, away from the cam publication
+    file_queue = queue.SimpleQueue()
+    file_listener = logging.handlers.QueueListener(
+        file_queue,
+        monitoring_handler,
+        reception_handler,
+        sending_handler,
+        respect_handler_level=True,
+    )
+    file_listener.start()
+    atexit.register(file_listener.stop)
+    file_queue_handler = RecordQueueHandler(file_queue)
+    monitoring_logger.addHandler(file_queue_handler)
+    reception_logger.addHandler(file_queue_handler)
+    sending_logger.addHandler(file_queue_handler)
+    # the stdout handler filters these records out anyway, don't hand them over
+    monitoring_logger.propagate = False
+    reception_logger.propagate = False
+    sending_logger.propagate = False
+
     # default log
     logger = logging.getLogger()
     logger_handler = logging.StreamHandler(stream=sys.stdout)
     # this is just to make the output look nice
-    logger_formatter = logging.Formatter(fmt="%(asctime)s %(levelname)s: %(message)s")
+    logger_formatter = SecondCachedFormatter(
+        fmt="%(asctime)s %(levelname)s: %(message)s"
+    )
     logger_handler.setFormatter(logger_formatter)
     logger_handler.addFilter(filter_default)
     logger.addHandler(logger_handler)
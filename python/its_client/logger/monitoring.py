@@ -11,6 +11,9 @@
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
 import logging
 
+# the logger configured by log_setup, looked up once
+_LOGGER = logging.getLogger("monitoring")
+
 
 def monitore_cam(
     vehicle_id: str,
@@ -23,9 +26,17 @@ def monitore_cam(
     partner: str,
     root_queue: str,
 ):
-    logging.getLogger("monitoring").info(
-        f"{vehicle_id} cam {direction} {partner}/{root_queue}"
-        f" {station_id}/{generation_delta_time}/lat:{latitude}/lng:{longitude} at {timestamp} "
+    _LOGGER.info(
+        "%s cam %s %s/%s %s/%s/lat:%s/lng:%s at %s ",
+        vehicle_id,
+        direction,
+        partner,
+        root_queue,
+        station_id,
+        generation_delta_time,
+        latitude,
+        longitude,
+        timestamp,
     )
 
 
@@ -43,10 +54,20 @@ def monitore_denm(
     root_queue: str,
     sender: str,
 ):
-    logging.getLogger("monitoring").info(
-        f"{vehicle_id} denm received_on {partner}/{root_queue}/{sender}"
-        f" {station_id}/{originating_station_id}/{sequence_number}/{reference_time}/{detection_time}"
-        f"/lat:{latitude}/lng:{longitude} at {timestamp}"
+    _LOGGER.info(
+        "%s denm received_on %s/%s/%s %s/%s/%s/%s/%s/lat:%s/lng:%s at %s",
+        vehicle_id,
+        partner,
+        root_queue,
+        sender,
+        station_id,
+        originating_station_id,
+        sequence_number,
+        reference_time,
+        detection_time,
+        latitude,
+        longitude,
+        timestamp,
     )
 
 
@@ -61,7 +82,15 @@ def monitore_cpm(
     partner: str,
     root_queue: str,
 ):
-    logging.getLogger("monitoring").info(
-        f"{vehicle_id} cpm {direction} {partner}/{root_queue}"
-        f" {station_id}/{generation_delta_time}/lat:{latitude}/lng:{longitude} at {timestamp} "
+    _LOGGER.info(
+        "%s cpm %s %s/%s %s/%s/lat:%s/lng:%s at %s ",
+        vehicle_id,
+        direction,
+        partner,
+        root_queue,
+        station_id,
+        generation_delta_time,
+        latitude,
+        longitude,
+        timestamp,
     )
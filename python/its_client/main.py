@@ -19,27 +19,29 @@ import time
 from its_client import configuration
 from its_client.mqtt.mqtt_client import MQTTClient
 from its_client.mqtt.mqtt_worker import MqttWorker
-from its_client.position import gpsd_py3
-from its_client.position import static
+from its_client.position import GeoPositionError, static
 
 stop_signal = threading.Event()
-global worker_process
-global mqtt_client
+position_lost = threading.Event()
+# a plain flag: the handler runs on the main thread, and setting an event there could
+# deadlock on the lock of an event the main thread is already waiting on
+interrupted = False
 
 
 def signal_handler(_sig, _frame):
-    global mqtt_client
-    global worker_process
-    logging.info("stop signal received")
-    stop_signal.set()
-    worker_process.join()
-    mqtt_client.loop_stop()
-    exit(3)
+    # only flag the stop here, the main thread stops the worker and the mqtt client
+    global interrupted
+    interrupted = True
+
+
+def run_worker(worker: MqttWorker):
+    try:
+        worker.run(stop_signal)
+    except GeoPositionError:
+        position_lost.set()
 
 
 def main():
-    global mqtt_client
-    global worker_process
     start_time = time.time()
 
     config = configuration.build()
@@ -56,7 +58,13 @@ def main():
         )
     else:
         logging.info(f"we use the gps position")
-        position_client = gpsd_py3.GeoPosition()
+        # the gps daemon client is only needed here
+        from its_client.position import gpsd_py3
+
+        try:
+            position_client = gpsd_py3.GeoPosition()
+        except GeoPositionError:
+            exit(3)
 
     logging.debug("handling stop signal...")
     signal.signal(signal.SIGINT, signal_handler)
@@ -78,18 +86,30 @@ def main():
     worker = MqttWorker(
         mqtt_client=mqtt_client, client_name=client_id, geo_position=position_client
     )
-    worker_process = threading.Thread(target=worker.run, args=(stop_signal,))
-    worker_process.start()
-    worker_process.join()
+    worker_thread = threading.Thread(target=run_worker, args=(worker,))
+    worker_thread.start()
+    # the main thread only turns the interruption flag into the stop signal
+    while worker_thread.is_alive():
+        if interrupted:
+            stop_signal.set()
+        worker_thread.join(MqttWorker.STEP_PERIOD)
 
-    if mqtt_client.is_connected():
+    if position_lost.is_set() or mqtt_client.position_lost:
+        logging.error("no more position, stopping mqtt client...")
+        mqtt_client.loop_stop()
+        return_code = 4
+    elif interrupted:
+        logging.info("stop signal received, stopping mqtt client...")
+        mqtt_client.loop_stop()
+        return_code = 3
+    elif mqtt_client.is_connected():
         logging.info("stopping mqtt client...")
         mqtt_client.loop_stop()
         return_code = 0
     else:
         logging.warning("unexpected end of mqtt client, stopping...")
         return_code = 5
-    logging.info(f"ended at {int(round(time.time() * 1000))}")
+    logging.info(f"ended at {time.time_ns() // 1_000_000}")
     exit(return_code)
 
 
@@ -23,9 +23,10 @@ def compute_distance(
     d_lon = radians(longitude_end - longitude_start)
     r_lat1 = radians(latitude_start)
     r_lat2 = radians(latitude_end)
-    a = sin(d_lat / 2) * sin(d_lat / 2) + cos(r_lat1) * cos(r_lat2) * sin(
-        d_lon / 2
-    ) * sin(d_lon / 2)
+    # each half-angle sine is computed once and squared
+    sin_d_lat = sin(d_lat / 2)
+    sin_d_lon = sin(d_lon / 2)
+    a = sin_d_lat * sin_d_lat + cos(r_lat1) * cos(r_lat2) * sin_d_lon * sin_d_lon
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
     d = radius * c  # Distance in km
     return d
@@ -9,16 +9,15 @@
 # [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
-import json
 import logging
+import sys
 import time
-from inspect import currentframe
-from inspect import getouterframes
 
+import orjson
 import paho.mqtt.client
 
 from its_client.logger import its, monitoring
-from its_client.position import GeoPosition
+from its_client.position import GeoPosition, GeoPositionError
 
 
 class MQTTClient(object):
@@ -29,6 +28,7 @@ class MQTTClient(object):
     CAM_RECEPTION_QUEUE = "5GCroCo/outQueue/v2x/cam"
     CPM_RECEPTION_QUEUE = "5GCroCo/outQueue/v2x/cpm"
     DENM_RECEPTION_QUEUE = "5GCroCo/outQueue/v2x/denm"
+    INFO_BROKER_QUEUE = "5GCroCo/outQueue/info/broker"
 
     def __init__(
         self,
@@ -50,98 +50,94 @@ class MQTTClient(object):
         self.geo_position = geo_position
         self.new_connection = False
         self.stop_signal = stop_signal
+        # set when the position is lost while handling a message, for the exit code
+        self.position_lost = False
 
     def on_disconnect(self, client, userdata, rc):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
         if rc != 0:
             logging.warning("unexpected disconnection")
             self.loop_stop()
             self.stop_signal.set()
 
     def on_connect(self, client, userdata, flags, rc):
-        logging.debug(
-            self._format_log(
-                f" called for {client.socket()} with {userdata} and {flags}"
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(
+                    f" called for {client.socket()} with {userdata} and {flags}"
+                )
             )
-        )
         if rc == 0:
             logging.info("connected to mqtt broker")
             # gather the gateway name
-            topic = "5GCroCo/outQueue/info/broker"
-            self.subscribe(topic)
+            self.subscribe(self.INFO_BROKER_QUEUE)
             # save the new connection status to trigger the subscriptions
             self.new_connection = True
 
     def on_message(self, _client, _userdata, message: paho.mqtt.client.MQTTMessage):
         logging.info(f"message received on topic {message.topic}")
-        logging.debug(
-            self._format_log(f"mid: {message.mid}, payload: {message.payload}")
-        )
-        if message.topic.endswith("5GCroCo/outQueue/info/broker"):
+        if len(message.payload) == 0:
+            # nothing to decode nor to record
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(self._format_log(f"mid: {message.mid}, empty payload"))
+            return
+        # as for the publication, the payload is only formatted when it's logged
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        if debug:
             logging.debug(
-                self._format_log(
-                    f"Instance id: {json.loads(message.payload)['instance_id']}"
-                )
+                self._format_log(f"mid: {message.mid}, payload: {message.payload}")
             )
-            self.gateway_name = json.loads(message.payload)["instance_id"]
+        if message.topic.endswith(self.INFO_BROKER_QUEUE):
+            self.gateway_name = orjson.loads(message.payload)["instance_id"]
+            if debug:
+                logging.debug(self._format_log(f"Instance id: {self.gateway_name}"))
         elif self.CAM_RECEPTION_QUEUE in message.topic:
-            if message.topic is not None and len(message.payload) > 0:
-                message_dict = json.loads(message.payload)
-                sender = message.topic.replace(self.CAM_RECEPTION_QUEUE, "").split("/")[
-                    1
-                ]
-                root_cam_topic = f"{self.CAM_RECEPTION_QUEUE}/{sender}"
-                lon, lat = self.geo_position.get_current_position()
-                monitoring.monitore_cam(
-                    vehicle_id=self.client_id,
-                    direction="received_on",
-                    station_id=message_dict["message"]["station_id"],
-                    generation_delta_time=message_dict["message"][
-                        "generation_delta_time"
-                    ],
-                    latitude=lat,
-                    longitude=lon,
-                    timestamp=int(round(time.time() * 1000)),
-                    partner=self.gateway_name,
-                    root_queue=root_cam_topic,
-                )
-                json_cam = json.dumps(message_dict)
-                its.record(json_cam)
+            message_dict = orjson.loads(message.payload)
+            # the queue is the first 4 levels of the topic, the sender the next one
+            sender = message.topic.split("/", 5)[4]
+            root_cam_topic = f"{self.CAM_RECEPTION_QUEUE}/{sender}"
+            lon, lat = self._current_position()
+            monitoring.monitore_cam(
+                vehicle_id=self.client_id,
+                direction="received_on",
+                station_id=message_dict["message"]["station_id"],
+                generation_delta_time=message_dict["message"]["generation_delta_time"],
+                latitude=lat,
+                longitude=lon,
+                timestamp=time.time_ns() // 1_000_000,
+                partner=self.gateway_name,
+                root_queue=root_cam_topic,
+            )
+            # dumped again to keep one record per line, whatever the sender's layout
+            its.record(orjson.dumps(message_dict).decode())
         elif self.DENM_RECEPTION_QUEUE in message.topic:
-            if message.topic is not None and len(message.payload) > 0:
-                message_dict = json.loads(message.payload)
-                lon, lat = self.geo_position.get_current_position()
-                monitoring.monitore_denm(
-                    vehicle_id=self.client_id,
-                    station_id=message_dict["message"]["station_id"],
-                    originating_station_id=message_dict["message"][
-                        "management_container"
-                    ]["action_id"]["originating_station_id"],
-                    sequence_number=message_dict["message"]["management_container"][
-                        "action_id"
-                    ]["sequence_number"],
-                    reference_time=message_dict["message"]["management_container"][
-                        "reference_time"
-                    ],
-                    detection_time=message_dict["message"]["management_container"][
-                        "detection_time"
-                    ],
-                    latitude=lat,
-                    longitude=lon,
-                    timestamp=int(round(time.time() * 1000)),
-                    partner=self.gateway_name,
-                    root_queue=self.DENM_RECEPTION_QUEUE,
-                    sender=message_dict["source_uuid"],
-                )
-                json_denm = json.dumps(message_dict)
-                its.record(json_denm)
+            message_dict = orjson.loads(message.payload)
+            management_container = message_dict["message"]["management_container"]
+            action_id = management_container["action_id"]
+            lon, lat = self._current_position()
+            monitoring.monitore_denm(
+                vehicle_id=self.client_id,
+                station_id=message_dict["message"]["station_id"],
+                originating_station_id=action_id["originating_station_id"],
+                sequence_number=action_id["sequence_number"],
+                reference_time=management_container["reference_time"],
+                detection_time=management_container["detection_time"],
+                latitude=lat,
+                longitude=lon,
+                timestamp=time.time_ns() // 1_000_000,
+                partner=self.gateway_name,
+                root_queue=self.DENM_RECEPTION_QUEUE,
+                sender=message_dict["source_uuid"],
+            )
+            its.record(orjson.dumps(message_dict).decode())
         elif self.CPM_RECEPTION_QUEUE in message.topic:
-            message_dict = json.loads(message.payload)
-            sender = message.topic.replace(self.CPM_RECEPTION_QUEUE, "").split("/")[1]
+            message_dict = orjson.loads(message.payload)
+            sender = message.topic.split("/", 5)[4]
             root_cpm_topic = f"{self.CPM_RECEPTION_QUEUE}/{sender}"
-            lon, lat = self.geo_position.get_current_position()
+            lon, lat = self._current_position()
             monitoring.monitore_cpm(
                 vehicle_id=self.client_id,
                 direction="received_on",
@@ -149,42 +145,56 @@ class MQTTClient(object):
                 generation_delta_time=message_dict["message"]["generation_delta_time"],
                 latitude=lat,
                 longitude=lon,
-                timestamp=int(round(time.time() * 1000)),
+                timestamp=time.time_ns() // 1_000_000,
                 partner=self.gateway_name,
                 root_queue=root_cpm_topic,
             )
-            json_denm = json.dumps(message_dict)
-            its.record(json_denm)
+            its.record(orjson.dumps(message_dict).decode())
+
+    def _current_position(self):
+        try:
+            return self.geo_position.get_current_position()
+        except GeoPositionError:
+            # raising here would kill the paho loop, so the worker is stopped instead
+            self.position_lost = True
+            self.stop_signal.set()
+            return None, None
 
     def on_publish(self, client, userdata, _mid):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def on_subscribe(self, client, userdata, _mid, _granted_qos):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def on_unsubscribe(self, client, userdata, _mid):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def on_socket_open(self, client, userdata, _sock):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def on_socket_close(self, client, userdata, _sock):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def on_socket_register_write(self, client, userdata, _sock):
-        logging.debug(
-            self._format_log(f" called for {client.socket()} with {userdata}")
-        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                self._format_log(f" called for {client.socket()} with {userdata}")
+            )
 
     def _connect(self):
         logging.info("connecting...")
@@ -225,7 +235,9 @@ class MQTTClient(object):
             )
 
     def publish(self, topic, payload=None, qos=1, retain=False, properties=None):
-        logging.debug(self._format_log(f"publishing payload: {payload}"))
+        # the caller frame lookup and the payload formatting are too costly for each cam
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(self._format_log(f"publishing payload: {payload}"))
         if self.client.is_connected():
             self.client.publish(topic, payload, qos, retain, properties)
             logging.info(f"message sent on topic {topic}")
@@ -252,4 +264,5 @@ class MQTTClient(object):
         return self.client.is_connected()
 
     def _format_log(self, message=""):
-        return f"{type(self).__name__}[{self.client_id}]::{getouterframes(currentframe())[1][3]} {message}"
+        # only the caller name is needed, not the whole stack
+        return f"{type(self).__name__}[{self.client_id}]::{sys._getframe(1).f_code.co_name} {message}"
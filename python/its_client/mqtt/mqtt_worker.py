@@ -10,9 +10,9 @@
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
 import logging
+import queue
 import threading
 import time
-from datetime import datetime, timedelta
 
 from its_client import quadtree, cam, mobility, roi
 from its_client.logger import its, monitoring
@@ -21,18 +21,30 @@ from its_client.position import GeoPosition
 
 class MqttWorker:
     QUEUE = "5GCroCo/inQueue/v2x/cam"
+    # seconds between the position time and the step before warning
+    POSITION_TIME_TOLERANCE = 0.3
+    # seconds, tune this, you might not get values that quickly
+    STEP_PERIOD = 0.2
+    # a second of cams, the oldest ones are dropped when the publication is late
+    PUBLISH_QUEUE_SIZE = 5
+    # seconds after which a cam is sent again even without any new position
+    HEARTBEAT_PERIOD = 1.0
 
     def __init__(self, mqtt_client, client_name, geo_position: GeoPosition):
         self.mqtt_client = mqtt_client
         self.client_name = client_name
+        self.root_cam_topic = f"{self.QUEUE}/{client_name}"
         self.geo_position = geo_position
         self.previous_step_timestamp = None
         self.previous_step_lon = None
         self.previous_step_lat = None
+        self.previous_position_time = None
         self.previous_alt = None
         self.previous_alt_step_counter = 0
         self.previous_heading = None
         self.previous_heading_step_counter = 0
+        # the cams are published by a dedicated thread, see _publish_loop
+        self.publish_queue = queue.Queue(maxsize=self.PUBLISH_QUEUE_SIZE)
 
         self.region = roi.RegionOfInterest()
 
@@ -45,6 +57,15 @@ class MqttWorker:
             heading,
             position_time,
         ) = self.geo_position.get_current_value()
+        # a single clock read for the whole step
+        now = time.time()
+        if (
+            position_time is not None
+            and position_time == self.previous_position_time
+            and now - self.previous_step_timestamp < self.HEARTBEAT_PERIOD
+        ):
+            logging.debug("the position didn't change, so no work processed")
+            return True
         if lon is not None and lat is not None and speed is not None:
             # alt
             (
@@ -67,17 +88,14 @@ class MqttWorker:
             )
             if heading is not None and alt is not None:
                 # topic
-                root_cam_topic = f"{self.QUEUE}/{self.client_name}"
-                cam_topic = f"{root_cam_topic}{quadtree.lat_lng_to_quad_key(lat, lon, 22, True)}"
-                # time
-                now = datetime.now()
-                utc_now = datetime.utcnow()
-                gps_utc_datetime = datetime.fromtimestamp(position_time.timestamp())
-                difference = utc_now - gps_utc_datetime
-                if abs(difference) > timedelta(milliseconds=300):
+                cam_topic = f"{self.root_cam_topic}{quadtree.lat_lng_to_quad_key(lat, lon, 22, True)}"
+                # the position time is in seconds since the epoch, as now
+                difference = now - position_time
+                abs_difference = abs(difference)
+                if abs_difference > self.POSITION_TIME_TOLERANCE:
                     logging.warning(
-                        f"the position time is {abs(difference).seconds * 1000 + abs(difference).microseconds / 1000} "
-                        f"ms in the {'future' if difference > timedelta(0) else 'past'}"
+                        f"the position time is {abs_difference * 1000} "
+                        f"ms in the {'future' if difference > 0 else 'past'}"
                     )
 
                 # acceleration
@@ -94,14 +112,14 @@ class MqttWorker:
                         latitude_end=lat,
                         longitude_end=lon,
                         time_start=self.previous_step_timestamp,
-                        time_end=now.timestamp(),
+                        time_end=now,
                     )
                 # speed
                 km_speed = mobility.mps_to_kmph(speed)
-                logging.debug(f"current speed: {speed} km/h")
+                logging.debug("current speed: %s km/h", speed)
                 message = cam.CooperativeAwarenessMessage(
                     uuid=self.client_name,
-                    timestamp=now.timestamp(),
+                    timestamp=now,
                     latitude=lat,
                     longitude=lon,
                     altitude=alt,
@@ -109,47 +127,91 @@ class MqttWorker:
                     acceleration=acceleration,
                     heading=heading,
                 )
-                json_cam = message.to_json()
-                # threading
-                publish = threading.Thread(
-                    target=self.mqtt_client.publish, args=(cam_topic, json_cam)
-                )
-                publish.start()
-                # no threading
-                # self.mqtt_client.publish(cam_topic, json_cam)
-                monitoring.monitore_cam(
-                    vehicle_id=self.client_name,
-                    direction="sent_on",
-                    station_id=message.station_id,
-                    generation_delta_time=message.generation_delta_time(),
-                    latitude=lat,
-                    longitude=lon,
-                    timestamp=int(round(now.timestamp() * 1000)),
-                    partner=self.mqtt_client.gateway_name,
-                    root_queue=root_cam_topic,
-                )
-                its.create_cam(json_cam)
+                # the cam is monitored once published, see _publish_loop
+                self._enqueue((cam_topic, message, lat, lon))
                 self.region.update_subscription(
                     latitude=lat, longitude=lon, speed=speed, client=self.mqtt_client
                 )
-                self.previous_step_timestamp = now.timestamp()
+                self.previous_step_timestamp = now
                 self.previous_step_lat = lat
                 self.previous_step_lon = lon
-                # threading
-                publish.join()
-                del publish
+                self.previous_position_time = position_time
             else:
-                logging.debug(f"no heading or altitude, so no work processed")
+                logging.debug("no heading or altitude, so no work processed")
         else:
-            logging.debug(f"no lat or lon or speed, so no work processed")
+            logging.debug("no lat or lon or speed, so no work processed")
         return True
 
     def run(self, stop_event):
         logging.info("mqtt worker run")
-        while stop_event is None or not stop_event.is_set():
-            self.step()
-            time.sleep(0.2)  # tune this, you might not get values that quickly
-        logging.info("mqtt worker finished")
+        publisher = threading.Thread(target=self._publish_loop)
+        publisher.start()
+        if stop_event is None:
+            stop_event = threading.Event()
+        # the steps are scheduled on a monotonic clock, so their duration doesn't drift
+        next_step = time.monotonic()
+        try:
+            while not stop_event.is_set():
+                self.step()
+                next_step += self.STEP_PERIOD
+                delay = next_step - time.monotonic()
+                if delay < 0:
+                    # a step just late is only delayed, the whole periods are missed
+                    missed = int(-delay // self.STEP_PERIOD)
+                    if missed >= 1:
+                        logging.warning("%s step(s) missed", missed)
+                    next_step -= delay
+                    delay = 0
+                # waiting on the event instead of sleeping stops the worker right away
+                stop_event.wait(delay)
+        finally:
+            # even on a step error, the publisher must stop or the process won't end,
+            # and a blocking put would wait forever on a full queue
+            self._enqueue(None)
+            publisher.join()
+            logging.info("mqtt worker finished")
+
+    def _publish_loop(self):
+        # a slow publication doesn't delay the next steps, None stops the loop
+        while True:
+            item = self.publish_queue.get()
+            if item is None:
+                return
+            cam_topic, message, lat, lon = item
+            # a failed publication must not stop the next ones
+            try:
+                json_cam = message.to_json()
+                self.mqtt_client.publish(cam_topic, json_cam)
+                its.create_cam(json_cam)
+                monitoring.monitore_cam(
+                    vehicle_id=self.client_name,
+                    direction="sent_on",
+                    station_id=message.station_id,
+                    generation_delta_time=message.generation_delta_time,
+                    latitude=lat,
+                    longitude=lon,
+                    timestamp=message.timestamp,
+                    partner=self.mqtt_client.gateway_name,
+                    root_queue=self.root_cam_topic,
+                )
+            except Exception:
+                logging.exception(f"the cam publication on {cam_topic} failed")
+
+    def _enqueue(self, item):
+        while True:
+            try:
+                self.publish_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    _, dropped, _, _ = self.publish_queue.get_nowait()
+                    logging.warning(
+                        "the publication is late, the oldest cam %s/%s is dropped",
+                        dropped.station_id,
+                        dropped.generation_delta_time,
+                    )
+                except queue.Empty:
+                    pass
 
 
 def _manage_optional_field(
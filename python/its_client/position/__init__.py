@@ -9,5 +9,12 @@
 # [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+
+# the gpsd provider is only imported when the gps position is used
 from .static import GeoPosition
-from .gpsd_py3 import GeoPosition
+
+
+class GeoPositionError(Exception):
+    """
+    The position provider can't give any position anymore.
+    """
@@ -10,30 +10,53 @@
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
 import logging
+from datetime import datetime
 
 from gpsd import connect, get_current, GpsResponse, NoFixError
 
+from its_client.position import GeoPositionError
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _parse_time(value: str) -> float:
+    # the gpsd utc time "YYYY-MM-DDTHH:MM:SS[.fff]Z" is sliced, strptime is slow
+    position_time = datetime(
+        int(value[0:4]),
+        int(value[5:7]),
+        int(value[8:10]),
+        int(value[11:13]),
+        int(value[14:16]),
+        int(value[17:19]),
+        int(value[20:-1].ljust(6, "0")) if len(value) > 21 else 0,
+    )
+    # as time.time(), the seconds since the epoch
+    return (position_time - _EPOCH).total_seconds()
+
 
 class GeoPosition:
+    __slots__ = ("packet", "connected")
+
     def __init__(self):
+        # last packet polled from the gps daemon, shared with the position readers
+        self.packet = None
         try:
             connect()
             self.connected = True
         except Exception as error:
             logging.error(f"a gps init error occurs:{error}")
-            exit(3)
+            raise GeoPositionError(error) from error
 
     def get_current_position(self, packet: GpsResponse = None):
         if self.connected:
             try:
                 if packet is None:
-                    packet = get_current()
+                    packet = self.packet if self.packet is not None else get_current()
                 if packet is not None:
                     if packet.mode >= 2:
                         lat, lon = packet.position()
-                        logging.debug(
-                            f"location received: lon {str(lon)}, lat {str(lat)}"
-                        )
+                        logging.debug("location received: lon %s, lat %s", lon, lat)
                         return lon, lat
                     else:
                         logging.warning("no location available")
@@ -41,31 +64,41 @@ class GeoPosition:
                 logging.warning(f"a gps user warning occurs:{error}")
             except NoFixError as error:
                 logging.error(f"a no fix gps error occurs:{error}")
-                exit(4)
+                raise GeoPositionError(error) from error
             except Exception as error:
                 logging.error(f"a gps error occurs:{error}")
-                exit(4)
+                raise GeoPositionError(error) from error
         return None, None
 
     def get_current_value(self):
-        logging.debug(f"gps value calling")
+        logging.debug("gps value calling")
         if self.connected:
+            # only a fresh fix is shared, the readers poll again otherwise
+            self.packet = None
             try:
                 packet = get_current()
-                lon, lat = self.get_current_position(packet)
                 if packet.mode >= 3:
-                    altitude = packet.altitude()
-                    logging.debug("altitude received:" + str(altitude))
-                    movement = packet.movement()
-                    logging.debug("movement received:" + str(movement))
-                    position_time = packet.get_time()
-                    logging.debug("time received:" + str(position_time))
+                    # a 3d fix carries all the fields, so we read them as they are
+                    position_time = _parse_time(packet.time)
+                    self.packet = packet
+                    # the fix is read at each step, mostly without the debug level
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug(
+                            "location received: lon %s, lat %s", packet.lon, packet.lat
+                        )
+                        logging.debug("altitude received:%s", packet.alt)
+                        logging.debug(
+                            "movement received: speed %s, track %s",
+                            packet.hspeed,
+                            packet.track,
+                        )
+                        logging.debug("time received:%s", position_time)
                     return (
-                        lon,
-                        lat,
-                        movement.get("speed"),
-                        altitude,
-                        movement.get("track"),
+                        packet.lon,
+                        packet.lat,
+                        packet.hspeed,
+                        packet.alt,
+                        packet.track,
                         position_time,
                     )
                 else:
@@ -74,8 +107,8 @@ class GeoPosition:
                 logging.warning(f"a gps user warning occurs:{error}")
             except NoFixError as error:
                 logging.error(f"a no fix gps error occurs:{error}")
-                exit(4)
+                raise GeoPositionError(error) from error
             except Exception as error:
                 logging.error(f"a gps error occurs:{error}")
-                exit(4)
+                raise GeoPositionError(error) from error
         return None, None, None, None, None, None
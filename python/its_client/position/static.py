@@ -10,10 +10,12 @@
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
 import random
-from datetime import datetime
+import time
 
 
 class GeoPosition:
+    __slots__ = ("count", "lat", "lon")
+
     def __init__(self, latitude: float, longitude: float):
         self.count = 0
         self.lat = latitude
@@ -38,5 +40,5 @@ class GeoPosition:
         speed = 0.103
         alt = 131.693
         heading = 130.7275
-        position_time = datetime.utcnow()
+        position_time = time.time()
         return lon, lat, speed, alt, heading, position_time
@@ -10,55 +10,120 @@
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
 import logging
+import math
+from functools import lru_cache
 
-from pygeotile.tile import Tile
 
+# the bits of a byte spread on 16 bits, to interleave the tile x and y bit by bit
+_SPREAD_BYTE = [
+    sum(((byte >> bit) & 1) << (2 * bit) for bit in range(8)) for byte in range(256)
+]
 
+
+def _interleave(x: int, y: int) -> int:
+    morton = 0
+    shift = 0
+    while x or y:
+        morton |= (_SPREAD_BYTE[x & 0xFF] | _SPREAD_BYTE[y & 0xFF] << 1) << shift
+        x >>= 8
+        y >>= 8
+        shift += 16
+    return morton
+
+
+# the 4 quadkey digits of each byte of the interleaved bits
+_BYTE_DIGITS = [
+    "".join("0123"[(byte >> shift) & 3] for shift in (6, 4, 2, 0))
+    for byte in range(256)
+]
+
+
+def _tile_to_quad_key(x: int, y: int, level_of_detail: int) -> str:
+    # each quadkey digit is a pair of interleaved bits, x for the low one
+    mask = (1 << level_of_detail) - 1
+    morton = _interleave(x & mask, y & mask)
+    digits = "".join(
+        _BYTE_DIGITS[(morton >> shift) & 0xFF]
+        for shift in range(8 * ((level_of_detail - 1) // 4), -1, -8)
+    )
+    return digits[len(digits) - level_of_detail :]
+
+
+# the spherical mercator constants of pyGeoTile 1.0.6 (MIT), which this projection
+# follows operation by operation to give the same tiles
+_ORIGIN_SHIFT = 2.0 * math.pi * 6378137.0 / 2.0
+_INITIAL_RESOLUTION = 2.0 * math.pi * 6378137.0 / 256.0
+
+
+def _lat_lng_to_tile(latitude: float, longitude: float, level_of_detail: int) -> tuple:
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        raise ValueError(f"invalid position: {latitude}, {longitude}")
+    meter_x = longitude * _ORIGIN_SHIFT / 180.0
+    meter_y = math.log(math.tan((90.0 + latitude) * math.pi / 360.0))
+    meter_y = meter_y / (math.pi / 180.0) * _ORIGIN_SHIFT / 180.0
+    resolution = _INITIAL_RESOLUTION / (2**level_of_detail)
+    pixel_x = abs(round((meter_x + _ORIGIN_SHIFT) / resolution))
+    pixel_y = abs(round((meter_y - _ORIGIN_SHIFT) / resolution))
+    # the tile holding the pixel, with the pixel 0 in the tile -1 as in pyGeoTile
+    return (pixel_x - 1) >> 8, (pixel_y - 1) >> 8
+
+
+# the cam and cpm regions share the same zoom, and a stopped vehicle the same position
+@lru_cache(maxsize=64)
 def lat_lng_to_quad_key(latitude, longitude, level_of_detail, slash=False):
-    tile = Tile.for_latitude_longitude(latitude, longitude, level_of_detail)
+    tile_x, tile_y = _lat_lng_to_tile(latitude, longitude, level_of_detail)
+    quad_tree = _tile_to_quad_key(tile_x, tile_y, level_of_detail)
     if slash:
-        quad_tree = f"/{'/'.join(tile.quad_tree)}"
-    else:
-        quad_tree = tile.quad_tree
+        quad_tree = f"/{'/'.join(quad_tree)}"
     return quad_tree
 
 
+# the digits on the edge of their parent tile, for each direction
+_EDGES = {
+    "up": frozenset({0, 1}),
+    "right": frozenset({1, 3}),
+    "down": frozenset({2, 3}),
+    "left": frozenset({0, 2}),
+}
+
+
 def is_edgy(direction, quadkey):
-    return (
-        int(quadkey)
-        in {"up": [0, 1], "right": [1, 3], "down": [2, 3], "left": [0, 2]}[direction]
-    )
+    return int(quadkey) in _EDGES[direction]
+
+
+# the digit of the neighbour tile in the same parent, for each digit
+_UP_OR_DOWN = {"0": "2", "1": "3", "2": "0", "3": "1"}
+_RIGHT_OR_LEFT = {"0": "1", "1": "0", "2": "3", "3": "2"}
 
 
 def get_up_or_down(quadkey):
-    return str((int(quadkey) + 2) % 4)
+    return _UP_OR_DOWN[quadkey]
 
 
 def get_right_or_left(quadkey):
-    quadkey_as_int = int(quadkey)
-    if quadkey_as_int % 2 == 0:
-        return str((quadkey_as_int + 1) % 4)
-    else:
-        return str((quadkey_as_int - 1) % 4)
+    return _RIGHT_OR_LEFT[quadkey]
 
 
-def get_neighbour(quadkey, direction):
-    edge_crossed = False
-    result = ""
+# the same transitions for a whole key, and the edge digits to strip, for each direction
+_NEIGHBOUR_TABLES = {
+    "up": str.maketrans(_UP_OR_DOWN),
+    "down": str.maketrans(_UP_OR_DOWN),
+    "right": str.maketrans(_RIGHT_OR_LEFT),
+    "left": str.maketrans(_RIGHT_OR_LEFT),
+}
+_EDGE_DIGITS = {
+    direction: "".join(str(digit) for digit in sorted(digits))
+    for direction, digits in _EDGES.items()
+}
 
-    for index, q in enumerate(quadkey[::-1]):
-        if index == 0 or edge_crossed:
-            edge_crossed = is_edgy(direction, q)
-            result += {
-                "up": get_up_or_down,
-                "down": get_up_or_down,
-                "right": get_right_or_left,
-                "left": get_right_or_left,
-            }[direction](q)
-        else:
-            result += q
 
-    return result[::-1]
+# the neighbourhoods of the tiles around the vehicle share most of their neighbours
+@lru_cache(maxsize=2048)
+def get_neighbour(quadkey, direction):
+    # the digits change from the last one up to the first one not crossing an edge,
+    # the ones before are kept as they are
+    start = max(len(quadkey.rstrip(_EDGE_DIGITS[direction])) - 1, 0)
+    return quadkey[:start] + quadkey[start:].translate(_NEIGHBOUR_TABLES[direction])
 
 
 def get_neighborhood(quadkey):
@@ -68,30 +133,33 @@ def get_neighborhood(quadkey):
     :param quadkey:     Quadkey to get the neighborhood of
     :return:            a list containing the quadkeys next to the one provided
     """
-    neighbors = []
+    # a copy, so the cached neighbourhood can't be changed by the caller, and the
+    # slashes removed without unslash, which logs each raw key it gets
+    return list(_neighborhood(quadkey.replace("/", "")))
 
-    quadkey = unslash(quadkey)
 
+# a vehicle going back and forth crosses the same tiles again
+@lru_cache(maxsize=256)
+def _neighborhood(quadkey):
     up = get_neighbour(quadkey, "up")
     down = get_neighbour(quadkey, "down")
-
-    neighbors.append(get_neighbour(up, "left"))
-    neighbors.append(up)
-    neighbors.append(get_neighbour(up, "right"))
-    neighbors.append(get_neighbour(quadkey, "left"))
-    neighbors.append(get_neighbour(quadkey, "right"))
-    neighbors.append(get_neighbour(down, "left"))
-    neighbors.append(down)
-    neighbors.append(get_neighbour(down, "right"))
-
-    return neighbors
+    return (
+        get_neighbour(up, "left"),
+        up,
+        get_neighbour(up, "right"),
+        get_neighbour(quadkey, "left"),
+        get_neighbour(quadkey, "right"),
+        get_neighbour(down, "left"),
+        down,
+        get_neighbour(down, "right"),
+    )
 
 
 def slash(unslashed_quadkey: str) -> str:
     if unslashed_quadkey.isdigit():
         return "/" + "/".join(unslashed_quadkey)
     else:
-        logging.debug(f"Key {unslashed_quadkey} is not unslashed, returning as is")
+        logging.debug("Key %s is not unslashed, returning as is", unslashed_quadkey)
         return unslashed_quadkey
 
 
@@ -99,12 +167,12 @@ def unslash(slashed_quadkey: str) -> str:
     if "/" in slashed_quadkey:
         return slashed_quadkey.replace("/", "")
     else:
-        logging.debug(f"Key {slashed_quadkey} is not slashed, returning as is")
+        logging.debug("Key %s is not slashed, returning as is", slashed_quadkey)
         return slashed_quadkey
 
 
 # This is the translation of the Java code given by Mathieu on 2019/11/15.
-# It works just fine but as long as pygeotile des not give us any error it's probably better to use this lib.
+# It isn't used: the tile is computed as pyGeoTile did, to keep the same quadkeys.
 #
 #
 #
@@ -9,12 +9,26 @@
 # [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
 # [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
 # for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+from functools import lru_cache
+
 from its_client import quadtree
 import logging
 
 from its_client.mqtt.mqtt_client import MQTTClient
 
 
+@lru_cache(maxsize=256)
+def _slashed(quadkey: str) -> str:
+    # the vehicle stays on the same few tiles between two moves
+    return quadtree.slash(quadkey)
+
+
+@lru_cache(maxsize=256)
+def _tile_topic(root_queue: str, quadkey: str) -> str:
+    # tile topics are built again when the vehicle moves away or comes back
+    return f"{root_queue}/+{_slashed(quadkey)}/#"
+
+
 class RegionOfInterest:
     ZOOM_BASE_DENM = 15
     ZOOM_BASE_CAM = 18
@@ -34,7 +48,7 @@ class RegionOfInterest:
         self.cam_right = None
         self.cam_up = None
         self.cam_down = None
-        self.cam_subscription = []
+        self.cam_subscription = set()
 
         # CPM
         self.cpm_position = None
@@ -42,7 +56,7 @@ class RegionOfInterest:
         self.cpm_right = None
         self.cpm_up = None
         self.cpm_down = None
-        self.cpm_subscription = []
+        self.cpm_subscription = set()
 
         # DENM
         self.denm_position = None
@@ -50,14 +64,14 @@ class RegionOfInterest:
         self.denm_right = None
         self.denm_up = None
         self.denm_down = None
-        self.denm_subscription = []
+        self.denm_subscription = set()
 
     def update_subscription(
         self, latitude, longitude, speed: float, client: MQTTClient
     ):
-        logging.debug(f"we update the Region Of Interest")
+        logging.debug("we update the Region Of Interest")
         if client.new_connection is True:
-            logging.info(f"a new connection is detected, we reinitialise")
+            logging.info("a new connection is detected, we reinitialise")
             self._reinit()
             client.new_connection = False
         self._update_cam_subscription(latitude, longitude, speed, client)
@@ -68,16 +82,16 @@ class RegionOfInterest:
         self, latitude, longitude, speed: float, client: MQTTClient
     ):
         zoom_base = self._correct_zoom_level(speed, self.ZOOM_BASE_CAM)
-        new_position = quadtree.lat_lng_to_quad_key(
-            latitude, longitude, zoom_base, True
-        )
+        quadkey = quadtree.lat_lng_to_quad_key(latitude, longitude, zoom_base)
+        new_position = _slashed(quadkey)
         if new_position != self.cam_position:
-            self.cam_position = self._update_subscription(
-                new_position, self.cam_position, client.CAM_RECEPTION_QUEUE, client
+            logging.debug(
+                "the position changed from %s to %s", self.cam_position, new_position
             )
-            self._update_neighborhood_subscription(
-                set(self.cam_subscription),
-                set(quadtree.get_neighborhood(self.cam_position)),
+            self.cam_position = new_position
+            self.cam_subscription = self._update_neighborhood_subscription(
+                self.cam_subscription,
+                {quadkey, *quadtree.get_neighborhood(quadkey)},
                 client.CAM_RECEPTION_QUEUE,
                 client,
             )
@@ -86,16 +100,16 @@ class RegionOfInterest:
         self, latitude, longitude, speed: float, client: MQTTClient
     ):
         zoom_base = self._correct_zoom_level(speed, self.ZOOM_BASE_CPM)
-        new_position = quadtree.lat_lng_to_quad_key(
-            latitude, longitude, zoom_base, True
-        )
+        quadkey = quadtree.lat_lng_to_quad_key(latitude, longitude, zoom_base)
+        new_position = _slashed(quadkey)
         if new_position != self.cpm_position:
-            self.cpm_position = self._update_subscription(
-                new_position, self.cpm_position, client.CPM_RECEPTION_QUEUE, client
+            logging.debug(
+                "the position changed from %s to %s", self.cpm_position, new_position
             )
-            self._update_neighborhood_subscription(
-                set(self.cpm_subscription),
-                set(quadtree.get_neighborhood(self.cpm_position)),
+            self.cpm_position = new_position
+            self.cpm_subscription = self._update_neighborhood_subscription(
+                self.cpm_subscription,
+                {quadkey, *quadtree.get_neighborhood(quadkey)},
                 client.CPM_RECEPTION_QUEUE,
                 client,
             )
@@ -104,47 +118,24 @@ class RegionOfInterest:
         self, latitude, longitude, speed: float, client: MQTTClient
     ):
         zoom_base = self._correct_zoom_level(speed, self.ZOOM_BASE_DENM)
-        new_position = quadtree.lat_lng_to_quad_key(
-            latitude, longitude, zoom_base, True
-        )
+        quadkey = quadtree.lat_lng_to_quad_key(latitude, longitude, zoom_base)
+        new_position = _slashed(quadkey)
         if new_position != self.denm_position:
-            self.denm_position = self._update_subscription(
-                new_position, self.denm_position, client.DENM_RECEPTION_QUEUE, client
+            logging.debug(
+                "the position changed from %s to %s", self.denm_position, new_position
             )
-            self._update_neighborhood_subscription(
-                set(self.denm_subscription),
-                set(quadtree.get_neighborhood(self.denm_position)),
+            self.denm_position = new_position
+            self.denm_subscription = self._update_neighborhood_subscription(
+                self.denm_subscription,
+                {quadkey, *quadtree.get_neighborhood(quadkey)},
                 client.DENM_RECEPTION_QUEUE,
                 client,
             )
 
     @staticmethod
     def _correct_zoom_level(speed: float, level_of_detail: int) -> int:
-        if speed > 135:
-            zoom_base = level_of_detail - 2
-        elif speed > 95:
-            zoom_base = level_of_detail - 1
-        else:
-            zoom_base = level_of_detail
-        return zoom_base
-
-    @staticmethod
-    def _update_subscription(
-        new_position: str, old_position: str, root_queue: str, client: MQTTClient
-    ) -> str:
-        logging.debug(
-            f"we compare the current position {new_position} with the previous one {old_position}"
-        )
-        if new_position != old_position:
-            new_topic = f"{root_queue}/+{new_position}/#"
-            logging.debug(f"we subscribe to {new_topic}")
-            client.subscribe(new_topic)
-            if old_position is not None:
-                old_topic = f"{root_queue}/+{old_position}/#"
-                logging.debug(f"we unsubscribe to {old_topic}")
-                client.unsubscribe(old_topic)
-            old_position = new_position
-        return old_position
+        # one level less above 95, two above 135
+        return level_of_detail - (speed > 135) - (speed > 95)
 
     @staticmethod
     def _update_neighborhood_subscription(
@@ -152,17 +143,24 @@ class RegionOfInterest:
         current_neighbors: set,
         root_queue: str,
         client: MQTTClient,
-    ):
+    ) -> set:
+        if current_neighbors == current_subscription:
+            return current_subscription
+        # the position is one of the tiles, only the tiles entering or leaving the
+        # neighbourhood are changed, and the new ones are subscribed first
         exclusion = current_neighbors ^ current_subscription
         unsubscribe_to = exclusion & current_subscription
         subscribe_to = exclusion & current_neighbors
 
-        for key in subscribe_to:
-            topic = f"{root_queue}/+{quadtree.slash(key)}/#"
-            logging.debug(f"Subscribing to neighbour topic: {topic}")
-            client.subscribe(topic)
+        # a single subscribe and a single unsubscribe packet for all the tiles
+        if subscribe_to:
+            topics = [(_tile_topic(root_queue, key), 0) for key in subscribe_to]
+            logging.debug("Subscribing to region topics: %s", topics)
+            client.subscribe(topics)
+
+        if unsubscribe_to:
+            topics = [_tile_topic(root_queue, key) for key in unsubscribe_to]
+            logging.debug("Unsubscribing to region topics: %s", topics)
+            client.unsubscribe(topics)
 
-        for key in unsubscribe_to:
-            topic = f"{root_queue}/+{quadtree.slash(key)}/#"
-            logging.debug(f"Unsubscribing to neighbour topic: {topic}")
-            client.unsubscribe(topic)
+        return current_neighbors
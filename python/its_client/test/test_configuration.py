@@ -153,3 +153,5 @@ class TestConfiguration(unittest.TestCase):
             self.config.getfloat("position", "longitude"), position_longitude
         )
         self.assertEqual(self.config.get("log", "default_level"), log_default_level)
+        self.assertEqual(self.config.getint("log", "batch_size"), 64)
+        self.assertEqual(self.config.getfloat("log", "batch_interval"), 1.0)
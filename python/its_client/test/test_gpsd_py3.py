@@ -0,0 +1,93 @@
+# Software Name: its-client
+# SPDX-FileCopyrightText: Copyright (c) 2016-2022 Orange
+# SPDX-License-Identifier: MIT License
+#
+# This software is distributed under the MIT license, see LICENSE.txt file for more details.
+#
+# Author: Frédéric GARDES <frederic.gardes@orange.com> et al.
+# Software description: This Intelligent Transportation Systems (ITS)
+# [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
+# [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
+# for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+import unittest
+from unittest import mock
+
+from gpsd import GpsResponse
+
+from its_client.position import GeoPositionError
+from its_client.position import gpsd_py3
+from its_client.position.gpsd_py3 import _parse_time
+
+
+def _packet(time: str) -> GpsResponse:
+    return GpsResponse.from_json(
+        {
+            "active": 1,
+            "sky": [{}],
+            "tpv": [
+                {
+                    "mode": 3,
+                    "lat": 43.5,
+                    "lon": 1.2,
+                    "alt": 131.2,
+                    "track": 12.5,
+                    "speed": 3.4,
+                    "time": time,
+                }
+            ],
+        }
+    )
+
+
+class TestParseTime(unittest.TestCase):
+    def test_parse_time_with_milliseconds(self):
+        self.assertEqual(1651399872.345, _parse_time("2022-05-01T10:11:12.345Z"))
+
+    def test_parse_time_with_a_shorter_fraction(self):
+        self.assertEqual(1651399872.5, _parse_time("2022-05-01T10:11:12.5Z"))
+
+    def test_parse_time_without_fraction(self):
+        self.assertEqual(1651399872.0, _parse_time("2022-05-01T10:11:12Z"))
+
+    def test_parse_time_empty(self):
+        with self.assertRaises(ValueError):
+            _parse_time("")
+
+
+class TestGeoPosition(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(gpsd_py3, "connect"):
+            self.geo_position = gpsd_py3.GeoPosition()
+
+    def test_get_current_value(self):
+        packet = _packet("2022-05-01T10:11:12.345Z")
+        with mock.patch.object(gpsd_py3, "get_current", return_value=packet):
+            self.assertEqual(
+                (1.2, 43.5, 3.4, 131.2, 12.5, 1651399872.345),
+                self.geo_position.get_current_value(),
+            )
+
+    def test_get_current_value_without_time(self):
+        # gpsd-py3 leaves the time empty when the fix doesn't give it
+        packet = _packet("")
+        with mock.patch.object(gpsd_py3, "get_current", return_value=packet):
+            with self.assertRaises(GeoPositionError):
+                self.geo_position.get_current_value()
+
+    def test_get_current_value_shares_the_fix(self):
+        packet = _packet("2022-05-01T10:11:12.345Z")
+        with mock.patch.object(gpsd_py3, "get_current", return_value=packet):
+            self.geo_position.get_current_value()
+        self.assertIs(packet, self.geo_position.packet)
+
+    def test_get_current_value_error_forgets_the_fix(self):
+        packet = _packet("2022-05-01T10:11:12.345Z")
+        with mock.patch.object(gpsd_py3, "get_current", return_value=packet):
+            self.geo_position.get_current_value()
+        with mock.patch.object(gpsd_py3, "get_current", side_effect=UserWarning):
+            self.assertEqual((None,) * 6, self.geo_position.get_current_value())
+        self.assertIsNone(self.geo_position.packet)
+        with mock.patch.object(gpsd_py3, "get_current", return_value=_packet("")):
+            with self.assertRaises(GeoPositionError):
+                self.geo_position.get_current_value()
+        self.assertIsNone(self.geo_position.packet)
@@ -0,0 +1,80 @@
+# Software Name: its-client
+# SPDX-FileCopyrightText: Copyright (c) 2016-2022 Orange
+# SPDX-License-Identifier: MIT License
+#
+# This software is distributed under the MIT license, see LICENSE.txt file for more details.
+#
+# Author: Frédéric GARDES <frederic.gardes@orange.com> et al.
+# Software description: This Intelligent Transportation Systems (ITS)
+# [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
+# [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
+# for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+import logging
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from its_client.logger.logger import BatchRotatingFileHandler
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"msg": message, "levelno": logging.INFO})
+
+
+class TestBatchRotatingFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "batch.txt"
+        self.handler = None
+
+    def tearDown(self):
+        if self.handler is not None:
+            self.handler.close()
+        self.directory.cleanup()
+
+    def _content(self, path=None) -> str:
+        path = self.path if path is None else path
+        return path.read_text() if path.exists() else ""
+
+    def test_write_on_batch_size(self):
+        self.handler = BatchRotatingFileHandler(
+            filename=self.path, batch_size=3, batch_interval=60
+        )
+        self.handler.handle(_record("first"))
+        self.handler.handle(_record("second"))
+        self.assertEqual(self._content(), "")
+
+        self.handler.handle(_record("third"))
+        self.assertEqual(self._content(), "first\nsecond\nthird\n")
+
+    def test_write_on_batch_interval(self):
+        self.handler = BatchRotatingFileHandler(
+            filename=self.path, batch_size=64, batch_interval=0.1
+        )
+        self.handler.handle(_record("alone"))
+        self.assertEqual(self._content(), "")
+
+        # no other record comes, the timer writes the pending one
+        time.sleep(0.5)
+        self.assertEqual(self._content(), "alone\n")
+
+    def test_write_on_close(self):
+        self.handler = BatchRotatingFileHandler(
+            filename=self.path, batch_size=64, batch_interval=60
+        )
+        self.handler.handle(_record("pending"))
+        self.handler.close()
+        self.assertEqual(self._content(), "pending\n")
+
+    def test_rollover(self):
+        self.handler = BatchRotatingFileHandler(
+            filename=self.path, maxBytes=20, backupCount=2, batch_size=2
+        )
+        self.handler.handle(_record("record 1"))
+        self.handler.handle(_record("record 2"))
+        self.handler.handle(_record("record 3"))
+        self.handler.handle(_record("record 4"))
+
+        self.assertEqual(self._content(Path(f"{self.path}.1")), "record 1\nrecord 2\n")
+        self.assertEqual(self._content(), "record 3\nrecord 4\n")
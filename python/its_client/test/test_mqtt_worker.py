@@ -0,0 +1,67 @@
+# Software Name: its-client
+# SPDX-FileCopyrightText: Copyright (c) 2016-2022 Orange
+# SPDX-License-Identifier: MIT License
+#
+# This software is distributed under the MIT license, see LICENSE.txt file for more details.
+#
+# Author: Frédéric GARDES <frederic.gardes@orange.com> et al.
+# Software description: This Intelligent Transportation Systems (ITS)
+# [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
+# [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
+# for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+import time
+import unittest
+
+from its_client.mqtt.mqtt_client import MQTTClient
+from its_client.mqtt.mqtt_worker import MqttWorker
+
+
+class _Client:
+    CAM_RECEPTION_QUEUE = MQTTClient.CAM_RECEPTION_QUEUE
+    CPM_RECEPTION_QUEUE = MQTTClient.CPM_RECEPTION_QUEUE
+    DENM_RECEPTION_QUEUE = MQTTClient.DENM_RECEPTION_QUEUE
+
+    def __init__(self):
+        self.new_connection = False
+
+    def subscribe(self, topics):
+        pass
+
+    def unsubscribe(self, topics):
+        pass
+
+
+class _GeoPosition:
+    def __init__(self, position_time: float):
+        self.position_time = position_time
+
+    def get_current_value(self):
+        return 1.2, 43.5, 3.4, 131.2, 12.5, self.position_time
+
+
+class TestMqttWorker(unittest.TestCase):
+    def setUp(self):
+        self.geo_position = _GeoPosition(time.time())
+        self.worker = MqttWorker(_Client(), "test", self.geo_position)
+
+    def test_step_same_position(self):
+        self.worker.step()
+        self.worker.step()
+
+        # the second step is within the heartbeat period, no cam is queued again
+        self.assertEqual(1, self.worker.publish_queue.qsize())
+
+    def test_step_new_position(self):
+        self.worker.step()
+        self.geo_position.position_time += MqttWorker.STEP_PERIOD
+        self.worker.step()
+
+        self.assertEqual(2, self.worker.publish_queue.qsize())
+
+    def test_step_heartbeat(self):
+        self.worker.step()
+        # as if the heartbeat period went by since the last cam
+        self.worker.previous_step_timestamp -= MqttWorker.HEARTBEAT_PERIOD
+        self.worker.step()
+
+        self.assertEqual(2, self.worker.publish_queue.qsize())
@@ -105,6 +105,68 @@ class TestQuadTree(unittest.TestCase):
             ),
         )
 
+    def test_lat_lng_to_quad_key_path_with_a_level_of_detail_of_22(self):
+        self.assertEqual(
+            "1202200112031003231123",
+            quadtree.lat_lng_to_quad_key(
+                latitude=self.latitude / 10000000,
+                longitude=self.longitude / 10000000,
+                level_of_detail=22,
+            ),
+        )
+
+    def test_lat_lng_to_quad_key_path_with_a_level_of_detail_of_25(self):
+        self.assertEqual(
+            "1202200112031003231123201",
+            quadtree.lat_lng_to_quad_key(
+                latitude=self.latitude / 10000000,
+                longitude=self.longitude / 10000000,
+                level_of_detail=25,
+            ),
+        )
+
+    def test_lat_lng_to_tile_at_the_antimeridian(self):
+        # as with pyGeoTile, the pixel 0 is in the tile -1, so both sides share a key
+        self.assertEqual(
+            (262143, 90439),
+            quadtree._lat_lng_to_tile(self.latitude / 10000000, 180.0, 18),
+        )
+        self.assertEqual(
+            (-1, 90439),
+            quadtree._lat_lng_to_tile(self.latitude / 10000000, -180.0, 18),
+        )
+        self.assertEqual(
+            "131331111313111333",
+            quadtree.lat_lng_to_quad_key(self.latitude / 10000000, -180.0, 18),
+        )
+        self.assertEqual(
+            "131331111313111333",
+            quadtree.lat_lng_to_quad_key(self.latitude / 10000000, 180.0, 18),
+        )
+
+    def test_lat_lng_to_tile_at_the_mercator_limits(self):
+        self.assertEqual((2047, -1), quadtree._lat_lng_to_tile(85.0511287798, 0.0, 12))
+        self.assertEqual(
+            (2047, 4095), quadtree._lat_lng_to_tile(-85.0511287798, 0.0, 12)
+        )
+        self.assertEqual(
+            "233333333333", quadtree.lat_lng_to_quad_key(85.0511287798, 0.0, 12)
+        )
+        self.assertEqual(
+            "233333333333", quadtree.lat_lng_to_quad_key(-85.0511287798, 0.0, 12)
+        )
+
+    def test_lat_lng_to_quad_key_out_of_range(self):
+        # pyGeoTile raised an AssertionError instead
+        with self.assertRaises(ValueError):
+            quadtree.lat_lng_to_quad_key(
+                latitude=91.0, longitude=0.0, level_of_detail=12
+            )
+        with self.assertRaises(ValueError):
+            quadtree.lat_lng_to_quad_key(
+                latitude=0.0, longitude=-181.0, level_of_detail=12
+            )
+
 
 class TestNeighborhood(unittest.TestCase):
     """
@@ -0,0 +1,103 @@
+# Software Name: its-client
+# SPDX-FileCopyrightText: Copyright (c) 2016-2022 Orange
+# SPDX-License-Identifier: MIT License
+#
+# This software is distributed under the MIT license, see LICENSE.txt file for more details.
+#
+# Author: Frédéric GARDES <frederic.gardes@orange.com> et al.
+# Software description: This Intelligent Transportation Systems (ITS)
+# [MQTT](https://mqtt.org/) client based on the [JSon](https://www.json.org)
+# [ETSI](https://www.etsi.org/committee/its) specification transcription provides a ready to connect project
+# for the mobility (connected and autonomous vehicles, road side units, vulnerable road users,...).
+import unittest
+
+from its_client.mqtt.mqtt_client import MQTTClient
+from its_client.roi import RegionOfInterest
+
+# a cam tile width at the cam zoom level, in degrees of longitude
+_CAM_TILE = 360 / 2**RegionOfInterest.ZOOM_BASE_CAM
+
+
+class _Client:
+    CAM_RECEPTION_QUEUE = MQTTClient.CAM_RECEPTION_QUEUE
+    CPM_RECEPTION_QUEUE = MQTTClient.CPM_RECEPTION_QUEUE
+    DENM_RECEPTION_QUEUE = MQTTClient.DENM_RECEPTION_QUEUE
+
+    def __init__(self):
+        self.new_connection = False
+        self.subscribed = []
+        self.unsubscribed = []
+
+    def subscribe(self, topics):
+        self.subscribed.append([topic for topic, _ in topics])
+
+    def unsubscribe(self, topics):
+        self.unsubscribed.append(list(topics))
+
+    def cam(self, calls) -> list:
+        return [
+            topics
+            for topics in calls
+            if topics[0].startswith(f"{self.CAM_RECEPTION_QUEUE}/")
+        ]
+
+
+class TestRegionOfInterest(unittest.TestCase):
+    def setUp(self):
+        self.region = RegionOfInterest()
+        self.client = _Client()
+        # the middle of a cam tile, far from the denm tile edges
+        self.latitude = 43.5
+        self.longitude = 1.2 + _CAM_TILE / 2
+
+    def _update(self, longitude=None):
+        self.region.update_subscription(
+            latitude=self.latitude,
+            longitude=self.longitude if longitude is None else longitude,
+            speed=0,
+            client=self.client,
+        )
+
+    def test_first_update(self):
+        self._update()
+
+        # a single call of the 9 tiles per queue
+        self.assertEqual(3, len(self.client.subscribed))
+        for topics in self.client.subscribed:
+            self.assertEqual(9, len(set(topics)))
+        self.assertEqual([], self.client.unsubscribed)
+
+    def test_one_tile_move(self):
+        self._update()
+        self.client.subscribed.clear()
+
+        self._update(self.longitude + _CAM_TILE)
+
+        subscribed = self.client.cam(self.client.subscribed)
+        unsubscribed = self.client.cam(self.client.unsubscribed)
+        self.assertEqual(1, len(subscribed))
+        self.assertEqual(3, len(subscribed[0]))
+        self.assertEqual(1, len(unsubscribed))
+        self.assertEqual(3, len(unsubscribed[0]))
+
+    def test_unchanged_position(self):
+        self._update()
+        self.client.subscribed.clear()
+
+        self._update()
+
+        self.assertEqual([], self.client.subscribed)
+        self.assertEqual([], self.client.unsubscribed)
+
+    def test_new_connection(self):
+        self._update()
+        self.client.subscribed.clear()
+        self.client.new_connection = True
+
+        self._update()
+
+        self.assertFalse(self.client.new_connection)
+        self.assertEqual(3, len(self.client.subscribed))
+        for topics in self.client.subscribed:
+            self.assertEqual(9, len(set(topics)))
+        self.assertEqual([], self.client.unsubscribed)
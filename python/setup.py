@@ -28,7 +28,7 @@ setup(
     ],
     url="https://github.com/Orange-OpenSource/its-client",
     download_url="https://pypi.org/project/its-client",
-    packages=find_packages(exclude=["*.tests.*"]),
+    packages=find_packages(exclude=["*.test", "*.test.*"]),
     include_package_data=True,
     package_data={
         "its_client": ["its_client.cfg"],
@@ -43,8 +43,8 @@ setup(
     install_requires=[
         "ConfigParser==5.2.0",
         "gpsd-py3==0.3.0",
+        "orjson==3.8.3",
         "paho-mqtt==1.6.1",
-        "pyGeoTile==1.0.6",
     ],
     entry_points={"console_scripts": ["its-client = its_client.main:main"]},
 )